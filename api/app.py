@@ -1,14 +1,147 @@
 import os
-from flask import Flask, jsonify, request
-from dotenv import load_dotenv
 
-from data_acquisition.db import get_connection, init_db
+import orjson
+from flask import Flask, Response, jsonify, request
+from flask_orjson import OrjsonProvider
+
+MATCH_COLUMNS = (
+    "id_partida",
+    "data",
+    "campeonato",
+    "temporada",
+    "time_casa",
+    "time_fora",
+    "gols_casa",
+    "gols_fora",
+)
+
+INDEX_HTML = """
+<!doctype html>
+<html lang="pt-br">
+<head>
+  <meta charset="UTF-8">
+  <title>API-Brasileirão Dashboard</title>
+  <style>
+    body { font-family: Arial, sans-serif; margin: 24px; background: #f7f7f7; color: #222; }
+    h1 { margin-bottom: 0.5rem; }
+    .card { background: white; padding: 16px; margin-bottom: 16px; border-radius: 8px; box-shadow: 0 1px 4px rgba(0,0,0,0.1); }
+    label { display: block; margin-top: 8px; }
+    input, select { padding: 6px; margin-top: 4px; }
+    button { padding: 8px 12px; margin-top: 12px; cursor: pointer; }
+    pre { background: #111; color: #0f0; padding: 12px; border-radius: 6px; max-height: 320px; overflow: auto; }
+  </style>
+</head>
+<body>
+  <h1>API-Brasileirão</h1>
+
+  <div class="card">
+    <h2>Testar API</h2>
+    <label>Método
+      <select id="method">
+        <option value="GET">GET</option>
+        <option value="POST">POST</option>
+      </select>
+    </label>
+    <label>Endpoint
+      <select id="endpoint">
+        <option value="/health">/health (GET)</option>
+        <option value="/harvest">/harvest (POST)</option>
+      </select>
+    </label>
+    <div id="post-params" style="display:none;">
+      <label>start_season <input id="start_season" type="number" value="2018"></label>
+      <label>end_season <input id="end_season" type="number" value="2018"></label>
+      <label>include_player_stats
+        <select id="include_player_stats">
+          <option value="true">true</option>
+          <option value="false">false</option>
+        </select>
+      </label>
+    </div>
+    <button onclick="runRequest()">Enviar</button>
+    <pre id="response-box">{}</pre>
+  </div>
+
+  <div class="card">
+    <h2>Dados carregados</h2>
+    <label>Temporada (opcional) <input id="season_filter" type="number" placeholder="ex: 2023"></label>
+    <label>Limite <input id="limit_filter" type="number" value="20"></label>
+    <button onclick="loadMatches()">Listar partidas</button>
+    <pre id="data-box">{}</pre>
+  </div>
+
+  <script>
+    const methodSel = document.getElementById('method');
+    const endpointSel = document.getElementById('endpoint');
+    const postParams = document.getElementById('post-params');
+    methodSel.addEventListener('change', () => {
+      postParams.style.display = methodSel.value === 'POST' ? 'block' : 'none';
+    });
+    endpointSel.addEventListener('change', () => {
+      if (endpointSel.value === '/harvest') {
+        methodSel.value = 'POST';
+        postParams.style.display = 'block';
+      }
+    });
+
+    async function runRequest() {
+      const method = methodSel.value;
+      const endpoint = endpointSel.value;
+      let options = { method };
+      if (method === 'POST') {
+        options.headers = { 'Content-Type': 'application/json' };
+        options.body = JSON.stringify({
+          start_season: Number(document.getElementById('start_season').value),
+          end_season: Number(document.getElementById('end_season').value),
+          include_player_stats: document.getElementById('include_player_stats').value === 'true'
+        });
+      }
+      try {
+        const res = await fetch(endpoint, options);
+        const text = await res.text();
+        document.getElementById('response-box').textContent = text;
+      } catch (err) {
+        document.getElementById('response-box').textContent = err.toString();
+      }
+    }
+
+    async function loadMatches() {
+      const season = document.getElementById('season_filter').value;
+      const limit = document.getElementById('limit_filter').value || 20;
+      const params = new URLSearchParams({ limit });
+      if (season) params.append('season', season);
+      try {
+        const res = await fetch(`/data/matches?${params.toString()}`);
+        const text = await res.text();
+        document.getElementById('data-box').textContent = text;
+      } catch (err) {
+        document.getElementById('data-box').textContent = err.toString();
+      }
+    }
+  </script>
+</body>
+</html>
+"""
+# Encoded once at import so the landing page is served without per-request encoding.
+INDEX_BYTES = INDEX_HTML.encode("utf-8")
+
+_TRUE = frozenset({"1", "true", "yes", "on"})
+
+
+def _parse_bool(value: object, default: bool = True) -> bool:
+    """Interpret JSON booleans and query-string flags alike ("true", "1", "on", ...)."""
+    return default if value is None else str(value).lower() in _TRUE
 
 
 def create_app() -> Flask:
     """Application factory for the Flask API."""
+    from dotenv import load_dotenv
+
+    from data_acquisition.db import get_connection, init_db
+
     load_dotenv()
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     init_db()
 
     @app.route("/health", methods=["GET"])
@@ -20,16 +153,11 @@ def create_app() -> Flask:
         """Trigger the harvester for a season interval."""
         from data_acquisition.harvester import harvest_seasons
 
-        payload = request.get_json(silent=True) or {}
         # Allow query params as a fallback to make manual testing easier.
-        args = request.args
-        start_season = int(payload.get("start_season") or args.get("start_season", 2018))
-        end_season = int(payload.get("end_season") or args.get("end_season", start_season))
-        include_player_stats = (
-            bool(payload.get("include_player_stats"))
-            if "include_player_stats" in payload
-            else args.get("include_player_stats", "true").lower() == "true"
-        )
+        params = request.get_json(silent=True) or request.args
+        start_season = int(params.get("start_season") or 2018)
+        end_season = int(params.get("end_season") or start_season)
+        include_player_stats = _parse_bool(params.get("include_player_stats"))
 
         summary = harvest_seasons(
             start_season=start_season,
@@ -43,7 +171,7 @@ def create_app() -> Flask:
         """Return a small sample of matches for quick inspection."""
         limit = int(request.args.get("limit", 20))
         season = request.args.get("season")
-        query = "SELECT * FROM matches"
+        query = f"SELECT {', '.join(MATCH_COLUMNS)} FROM matches"
         params: list = []
         if season:
             query += " WHERE temporada = ?"
@@ -51,122 +179,18 @@ def create_app() -> Flask:
         query += " ORDER BY data DESC LIMIT ?"
         params.append(limit)
         with get_connection() as conn:
-            rows = conn.execute(query, params).fetchall()
-        data = [dict(r) for r in rows]
-        return jsonify({"count": len(data), "matches": data}), 200
+            cursor = conn.execute(query, params)
+            data = [dict(zip(MATCH_COLUMNS, r)) for r in cursor]
+        body = orjson.dumps({"count": len(data), "matches": data})
+        return app.response_class(body, mimetype="application/json"), 200
 
     @app.route("/", methods=["GET"])
-    def index() -> tuple[str, int]:
+    def index() -> Response:
         """Simple UI to exercise the API."""
-        return (
-            """
-            <!doctype html>
-            <html lang="pt-br">
-            <head>
-              <meta charset="UTF-8">
-              <title>API-Brasileirão Dashboard</title>
-              <style>
-                body { font-family: Arial, sans-serif; margin: 24px; background: #f7f7f7; color: #222; }
-                h1 { margin-bottom: 0.5rem; }
-                .card { background: white; padding: 16px; margin-bottom: 16px; border-radius: 8px; box-shadow: 0 1px 4px rgba(0,0,0,0.1); }
-                label { display: block; margin-top: 8px; }
-                input, select { padding: 6px; margin-top: 4px; }
-                button { padding: 8px 12px; margin-top: 12px; cursor: pointer; }
-                pre { background: #111; color: #0f0; padding: 12px; border-radius: 6px; max-height: 320px; overflow: auto; }
-              </style>
-            </head>
-            <body>
-              <h1>API-Brasileirão</h1>
-
-              <div class="card">
-                <h2>Testar API</h2>
-                <label>Método
-                  <select id="method">
-                    <option value="GET">GET</option>
-                    <option value="POST">POST</option>
-                  </select>
-                </label>
-                <label>Endpoint
-                  <select id="endpoint">
-                    <option value="/health">/health (GET)</option>
-                    <option value="/harvest">/harvest (POST)</option>
-                  </select>
-                </label>
-                <div id="post-params" style="display:none;">
-                  <label>start_season <input id="start_season" type="number" value="2018"></label>
-                  <label>end_season <input id="end_season" type="number" value="2018"></label>
-                  <label>include_player_stats
-                    <select id="include_player_stats">
-                      <option value="true">true</option>
-                      <option value="false">false</option>
-                    </select>
-                  </label>
-                </div>
-                <button onclick="runRequest()">Enviar</button>
-                <pre id="response-box">{}</pre>
-              </div>
-
-              <div class="card">
-                <h2>Dados carregados</h2>
-                <label>Temporada (opcional) <input id="season_filter" type="number" placeholder="ex: 2023"></label>
-                <label>Limite <input id="limit_filter" type="number" value="20"></label>
-                <button onclick="loadMatches()">Listar partidas</button>
-                <pre id="data-box">{}</pre>
-              </div>
-
-              <script>
-                const methodSel = document.getElementById('method');
-                const endpointSel = document.getElementById('endpoint');
-                const postParams = document.getElementById('post-params');
-                methodSel.addEventListener('change', () => {
-                  postParams.style.display = methodSel.value === 'POST' ? 'block' : 'none';
-                });
-                endpointSel.addEventListener('change', () => {
-                  if (endpointSel.value === '/harvest') {
-                    methodSel.value = 'POST';
-                    postParams.style.display = 'block';
-                  }
-                });
-
-                async function runRequest() {
-                  const method = methodSel.value;
-                  const endpoint = endpointSel.value;
-                  let options = { method };
-                  if (method === 'POST') {
-                    options.headers = { 'Content-Type': 'application/json' };
-                    options.body = JSON.stringify({
-                      start_season: Number(document.getElementById('start_season').value),
-                      end_season: Number(document.getElementById('end_season').value),
-                      include_player_stats: document.getElementById('include_player_stats').value === 'true'
-                    });
-                  }
-                  try {
-                    const res = await fetch(endpoint, options);
-                    const text = await res.text();
-                    document.getElementById('response-box').textContent = text;
-                  } catch (err) {
-                    document.getElementById('response-box').textContent = err.toString();
-                  }
-                }
-
-                async function loadMatches() {
-                  const season = document.getElementById('season_filter').value;
-                  const limit = document.getElementById('limit_filter').value || 20;
-                  const params = new URLSearchParams({ limit });
-                  if (season) params.append('season', season);
-                  try {
-                    const res = await fetch(`/data/matches?${params.toString()}`);
-                    const text = await res.text();
-                    document.getElementById('data-box').textContent = text;
-                  } catch (err) {
-                    document.getElementById('data-box').textContent = err.toString();
-                  }
-                }
-              </script>
-            </body>
-            </html>
-            """,
-            200,
+        return Response(
+            INDEX_BYTES,
+            mimetype="text/html",
+            headers={"Cache-Control": "public, max-age=3600"},
         )
 
     return app
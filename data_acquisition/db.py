@@ -2,15 +2,31 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
-from typing import Iterable, Optional, Dict, Tuple
+from typing import Iterable, Optional, Dict, Set, Tuple
 
 DB_PATH = Path(__file__).resolve().parents[1] / "futebol_data.db"
 
+# journal_mode is persisted in the database file, so it only needs to be set once
+# per process; the remaining pragmas are per-connection.
+_WAL_ENABLED = False
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+)
+
 
 def get_connection() -> sqlite3.Connection:
-    """Return a SQLite connection with row factory configured."""
+    """Return a SQLite connection with row factory and WAL pragmas configured."""
+    global _WAL_ENABLED
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    if not _WAL_ENABLED:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _WAL_ENABLED = True
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
@@ -36,6 +52,11 @@ def init_db() -> None:
                 cidade_jogo TEXT
             );
 
+            CREATE INDEX IF NOT EXISTS idx_matches_temp_data
+                ON matches (temporada, data DESC);
+            CREATE INDEX IF NOT EXISTS idx_matches_data
+                ON matches (data DESC);
+
             CREATE TABLE IF NOT EXISTS player_stats (
                 id_partida INTEGER NOT NULL,
                 id_jogador INTEGER NOT NULL,
@@ -56,18 +77,16 @@ def init_db() -> None:
         conn.commit()
 
 
-def match_exists(conn: sqlite3.Connection, fixture_id: int) -> bool:
-    cur = conn.execute(
-        "SELECT 1 FROM matches WHERE id_partida = ? LIMIT 1", (fixture_id,)
-    )
-    return cur.fetchone() is not None
+def existing_match_ids(conn: sqlite3.Connection, season: int) -> Set[int]:
+    """Return the ids of every stored match of a season in a single query."""
+    cur = conn.execute("SELECT id_partida FROM matches WHERE temporada = ?", (season,))
+    return {row[0] for row in cur}
 
 
-def player_stats_exists(conn: sqlite3.Connection, fixture_id: int) -> bool:
-    cur = conn.execute(
-        "SELECT 1 FROM player_stats WHERE id_partida = ? LIMIT 1", (fixture_id,)
-    )
-    return cur.fetchone() is not None
+def fixtures_with_player_stats(conn: sqlite3.Connection) -> Set[int]:
+    """Return the ids of every fixture that already has player stats stored."""
+    cur = conn.execute("SELECT DISTINCT id_partida FROM player_stats")
+    return {row[0] for row in cur}
 
 
 def insert_matches(conn: sqlite3.Connection, rows: Iterable[tuple]) -> None:
@@ -80,7 +99,6 @@ def insert_matches(conn: sqlite3.Connection, rows: Iterable[tuple]) -> None:
         """,
         rows,
     )
-    conn.commit()
 
 
 def insert_player_stats(
@@ -94,7 +112,6 @@ def insert_player_stats(
         """,
         rows,
     )
-    conn.commit()
 
 
 def upsert_team_info(
@@ -115,7 +132,6 @@ def upsert_team_info(
         """,
         (nome_time, cidade_sede, latitude, longitude),
     )
-    conn.commit()
 
 
 def seed_known_teams(
@@ -137,7 +153,6 @@ def seed_known_teams(
         """,
         rows,
     )
-    conn.commit()
 
 
 if __name__ == "__main__":
@@ -1,31 +1,51 @@
 from __future__ import annotations
 
-import json
+import atexit
 import os
+import tempfile
+import threading
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import orjson
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from data_acquisition.db import (
+    existing_match_ids,
+    fixtures_with_player_stats,
     get_connection,
     init_db,
     insert_matches,
     insert_player_stats,
-    match_exists,
-    player_stats_exists,
     seed_known_teams,
-    upsert_team_info,
 )
 from processing.coordinates import TEAM_COORDINATES, TEAM_CITIES
 
 BASE_URL = "https://v3.football.api-sports.io"
 
+# Shared across clients so repeated /harvest calls reuse pooled keep-alive connections.
+# Only failed connects are retried: they never reach the API, so RequestQuota's count of
+# one request per get() stays exact. Read/status retries would spend quota unseen.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.3),
+    ),
+)
+
 
+@lru_cache(maxsize=4096)
 def _normalize(team_name: str) -> str:
     if not team_name:
         return ""
@@ -48,42 +68,66 @@ TEAM_ALIASES = {
     "internacional": "internacional",
     "bragantino": "red bull bragantino",
 }
+SERIE_A_ALIASES = {
+    alias for alias, target in TEAM_ALIASES.items() if _normalize(target) in SERIE_A_TEAM_NAMES
+}
 
 
 def is_serie_a_team(team_name: str) -> bool:
     normalized = _normalize(team_name)
-    if normalized in SERIE_A_TEAM_NAMES:
-        return True
-    alias = TEAM_ALIASES.get(normalized)
-    if alias and _normalize(alias) in SERIE_A_TEAM_NAMES:
-        return True
-    return False
+    return normalized in SERIE_A_TEAM_NAMES or normalized in SERIE_A_ALIASES
 
 
 @dataclass
 class RequestQuota:
     log_path: Path
     daily_limit: int = 100
+    # Durability checkpoint: persist the counter every N consumes instead of on each one.
+    flush_every: int = 10
 
     def __post_init__(self) -> None:
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         self._state = {"date": date.today().isoformat(), "count": 0}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._unflushed = 0
         self._load()
+        atexit.register(self.flush)
 
     def _load(self) -> None:
-        if self.log_path.exists():
-            try:
-                data = json.loads(self.log_path.read_text())
-                if data.get("date") == date.today().isoformat():
-                    self._state = data
-                else:
-                    self._state = {"date": date.today().isoformat(), "count": 0}
-            except json.JSONDecodeError:
-                self._state = {"date": date.today().isoformat(), "count": 0}
-        self._save()
+        try:
+            data = orjson.loads(self.log_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except orjson.JSONDecodeError:
+            data = None
+        if isinstance(data, dict) and data.get("date") == self._state["date"]:
+            self._state = data
+        else:
+            # Stale or unreadable file: keep the fresh state and overwrite it on the next flush.
+            self._dirty = True
 
     def _save(self) -> None:
-        self.log_path.write_text(json.dumps(self._state))
+        # Write to a temp file and rename so a crash never leaves a torn quota file.
+        # The temp name is unique per write: other RequestQuota instances may share log_path.
+        with tempfile.NamedTemporaryFile(
+            dir=self.log_path.parent, prefix=self.log_path.name, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(orjson.dumps(self._state))
+        os.replace(tmp.name, self.log_path)
+        self._dirty = False
+        self._unflushed = 0
+
+    def flush(self) -> None:
+        """Persist the in-memory counter if it changed since the last write."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def close(self) -> None:
+        """Flush and drop the interpreter-exit hook registered for this quota."""
+        self.flush()
+        atexit.unregister(self.flush)
 
     @property
     def remaining(self) -> int:
@@ -94,16 +138,20 @@ class RequestQuota:
         return int(self._state.get("count", 0))
 
     def consume(self, amount: int = 1) -> bool:
-        if self.remaining < amount:
-            return False
-        self._state["count"] = int(self._state.get("count", 0)) + amount
-        self._save()
-        return True
+        with self._lock:
+            if self.remaining < amount:
+                return False
+            self._state["count"] = int(self._state.get("count", 0)) + amount
+            self._dirty = True
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._save()
+            return True
 
 
 class APIFootballClient:
     def __init__(self, api_key: str, quota: RequestQuota):
-        self.session = requests.Session()
+        self.session = _SESSION
         self.session.headers.update(
             {
                 "x-rapidapi-key": api_key,
@@ -117,7 +165,7 @@ class APIFootballClient:
             raise RuntimeError("Request limit reached for today")
         response = self.session.get(f"{BASE_URL}{path}", params=params or {}, timeout=30)
         response.raise_for_status()
-        payload = response.json()
+        payload = orjson.loads(response.content)
         return payload.get("response", payload)
 
 
@@ -147,19 +195,23 @@ def allowed_copa_round(round_str: str) -> bool:
     return False
 
 
-def allowed_competition(campeonato: str, fixture: dict) -> bool:
-    round_str = fixture.get("league", {}).get("round", "") or ""
-    home_name = fixture.get("teams", {}).get("home", {}).get("name", "")
-    away_name = fixture.get("teams", {}).get("away", {}).get("name", "")
+def _has_serie_a_side(fixture: dict) -> bool:
+    teams = fixture.get("teams", {})
+    home_name = teams.get("home", {}).get("name", "")
+    away_name = teams.get("away", {}).get("name", "")
+    return is_serie_a_team(home_name) or is_serie_a_team(away_name)
 
+
+def allowed_competition(campeonato: str, fixture: dict) -> bool:
     if campeonato == "Série A":
         return True
     if campeonato == "Copa do Brasil":
+        round_str = fixture.get("league", {}).get("round", "") or ""
         if not allowed_copa_round(round_str):
             return False
-        return is_serie_a_team(home_name) or is_serie_a_team(away_name)
+        return _has_serie_a_side(fixture)
     if campeonato == "Libertadores":
-        return is_serie_a_team(home_name) or is_serie_a_team(away_name)
+        return _has_serie_a_side(fixture)
     return False
 
 
@@ -237,67 +289,90 @@ def harvest_single_season(
         ("Libertadores", LEAGUE_IDS["LIBERTADORES"]),
     ]
 
-    for campeonato, league_id in competitions:
-        fixtures = fetch_fixtures(client, league_id, season)
-        total_fetched = len(fixtures)
-        kept_after_filter = 0
-        pending_rows: List[tuple] = []
-
-        for fixture in fixtures:
-            fixture_id = int(fixture.get("fixture", {}).get("id"))
-            if not allowed_competition(campeonato, fixture):
-                continue
-            exists = match_exists(conn, fixture_id)
-            stats_needed = include_player_stats and not player_stats_exists(
-                conn, fixture_id
-            )
-            if exists and not stats_needed:
-                skipped_existing += 1
-                continue
-
-            # Upsert known team info based on dictionary (city + coords)
-            for side in ("home", "away"):
-                team_name = fixture.get("teams", {}).get(side, {}).get("name")
-                if team_name and team_name in TEAM_COORDINATES:
-                    coords = TEAM_COORDINATES[team_name]
-                    city = TEAM_CITIES.get(team_name)
-                    upsert_team_info(
-                        conn,
-                        nome_time=team_name,
-                        cidade_sede=city,
-                        latitude=coords["lat"],
-                        longitude=coords["lon"],
-                    )
-
-            kept_after_filter += 1
-            if not exists:
-                pending_rows.append(fixture_to_row(fixture, campeonato))
-
-            if stats_needed and client.quota.remaining > 0:
-                try:
-                    stats_rows = fetch_player_stats(client, fixture_id)
-                    if stats_rows:
-                        insert_player_stats(conn, stats_rows)
-                        saved_player_stats += len(stats_rows)
-                except RuntimeError:
-                    break
-                except requests.HTTPError:
-                    continue
-
-        if pending_rows:
-            insert_matches(conn, pending_rows)
-            inserted_matches += len(pending_rows)
-        league_breakdown.append(
-            {
-                "campeonato": campeonato,
-                "league_id": league_id,
-                "season": season,
-                "fetched": total_fetched,
-                "kept_after_filter": kept_after_filter,
-                "inserted": len(pending_rows),
-            }
-        )
-
+    # Preload stored ids once instead of probing SQLite for every fixture.
+    existing = existing_match_ids(conn, season)
+    existing_stats = fixtures_with_player_stats(conn) if include_player_stats else set()
+    # Player stats for the whole season go to SQLite in one executemany.
+    pending_stats: List[tuple] = []
+
+    # Fixture lists are independent network calls; fetch them concurrently and keep
+    # the SQLite writes below sequential in competition order.
+    with ThreadPoolExecutor(max_workers=len(competitions)) as executor:
+        futures = [
+            executor.submit(fetch_fixtures, client, league_id, season)
+            for _, league_id in competitions
+        ]
+    # A league that failed (e.g. the quota ran out) must not discard the ones already
+    # paid for: store every fetched league, then surface the first failure.
+    fetch_error: Optional[BaseException] = None
+    fetched: List[tuple] = []
+    for competition, future in zip(competitions, futures):
+        exc = future.exception()
+        if exc is not None:
+            fetch_error = fetch_error or exc
+            continue
+        fetched.append((competition, future.result()))
+
+    try:
+        for (campeonato, league_id), fixtures in fetched:
+            total_fetched = len(fixtures)
+            kept_after_filter = 0
+            pending_rows: List[tuple] = []
+            try:
+                for fixture in fixtures:
+                    fixture_id = int(fixture.get("fixture", {}).get("id"))
+                    if not allowed_competition(campeonato, fixture):
+                        continue
+                    exists = fixture_id in existing
+                    stats_needed = include_player_stats and fixture_id not in existing_stats
+                    if exists and not stats_needed:
+                        skipped_existing += 1
+                        continue
+
+                    kept_after_filter += 1
+                    if not exists:
+                        pending_rows.append(fixture_to_row(fixture, campeonato))
+                        existing.add(fixture_id)
+
+                    if stats_needed and client.quota.remaining > 0:
+                        try:
+                            stats_rows = fetch_player_stats(client, fixture_id)
+                            if stats_rows:
+                                pending_stats.extend(stats_rows)
+                                existing_stats.add(fixture_id)
+                                saved_player_stats += len(stats_rows)
+                        except RuntimeError:
+                            break
+                        except (requests.RequestException, orjson.JSONDecodeError):
+                            continue
+            finally:
+                # Fixtures were already paid for; store them even if the loop above failed.
+                inserted = 0
+                if pending_rows:
+                    # INSERT OR IGNORE skips ids the preloaded set missed; count what landed.
+                    before = conn.total_changes
+                    insert_matches(conn, pending_rows)
+                    inserted = conn.total_changes - before
+                    inserted_matches += inserted
+                    skipped_existing += len(pending_rows) - inserted
+                league_breakdown.append(
+                    {
+                        "campeonato": campeonato,
+                        "league_id": league_id,
+                        "season": season,
+                        "fetched": total_fetched,
+                        "kept_after_filter": kept_after_filter,
+                        "inserted": inserted,
+                    }
+                )
+    finally:
+        # Helpers leave the transaction open; persist the season in one commit, including
+        # the rows gathered before an unexpected error aborted it.
+        if pending_stats:
+            insert_player_stats(conn, pending_stats)
+        conn.commit()
+    if fetch_error is not None:
+        raise fetch_error
     return {
         "season": season,
         "inserted_matches": inserted_matches,
@@ -322,21 +397,24 @@ def harvest_seasons(
     init_db()
 
     season_summaries = []
-    with get_connection() as conn:
-        # Seed known teams into teams_info for distance calculations.
-        known = {
-            name: (TEAM_CITIES.get(name), coords["lat"], coords["lon"])
-            for name, coords in TEAM_COORDINATES.items()
-        }
-        seed_known_teams(conn, known)
-        for season in range(start_season, end_season + 1):
-            try:
-                summary = harvest_single_season(
-                    client, conn, season, include_player_stats=include_player_stats
-                )
-                season_summaries.append(summary)
-            except RuntimeError as exc:
-                break
+    try:
+        with get_connection() as conn:
+            # Seed known teams into teams_info for distance calculations.
+            known = {
+                name: (TEAM_CITIES.get(name), coords["lat"], coords["lon"])
+                for name, coords in TEAM_COORDINATES.items()
+            }
+            seed_known_teams(conn, known)
+            for season in range(start_season, end_season + 1):
+                try:
+                    summary = harvest_single_season(
+                        client, conn, season, include_player_stats=include_player_stats
+                    )
+                    season_summaries.append(summary)
+                except RuntimeError as exc:
+                    break
+    finally:
+        quota.close()
 
     return {
         "seasons": season_summaries,
@@ -347,4 +425,4 @@ def harvest_seasons(
 
 if __name__ == "__main__":
     report = harvest_seasons()
-    print(json.dumps(report, indent=2))
+    print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
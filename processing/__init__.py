@@ -1,15 +1,7 @@
 """Feature engineering package."""
 
-from .features import (
-    compute_importance_score,
-    compute_key_players,
-    compute_rest_days,
-    compute_rolling_stats,
-    compute_travel_distance,
-)
-from .coordinates import TEAM_COORDINATES, CAPITAL_COORDINATES, TEAM_CITIES
-
 __all__ = [
+    "build_team_coords",
     "compute_importance_score",
     "compute_key_players",
     "compute_rest_days",
@@ -19,3 +11,18 @@ __all__ = [
     "TEAM_CITIES",
     "CAPITAL_COORDINATES",
 ]
+
+_COORDINATE_NAMES = {"TEAM_COORDINATES", "TEAM_CITIES", "CAPITAL_COORDINATES"}
+
+
+def __getattr__(name):
+    # Lazy import so `processing.coordinates` users (e.g. the harvester) do not pull in pandas
+    if name in _COORDINATE_NAMES:
+        from . import coordinates as _coordinates
+
+        return getattr(_coordinates, name)
+    if name in __all__:
+        from . import features as _features
+
+        return getattr(_features, name)
+    raise AttributeError(f"module {__name__} has no attribute {name}")
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 from math import asin, cos, radians, sin, sqrt
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional
 
+import numpy as np
 import pandas as pd
+from numba import njit, prange
 
 from .coordinates import CAPITAL_COORDINATES, TEAM_COORDINATES
 
+EARTH_RADIUS_KM = 6371.0
+# fastmath without the no-NaN/no-Inf assumptions: unknown coordinates travel as NaN.
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
 
+
+@lru_cache(maxsize=4096)
 def normalize_team_name(name: str) -> str:
     return (
         name.replace("-", " ")
@@ -21,9 +30,11 @@ def normalize_team_name(name: str) -> str:
     )
 
 
+# No fastmath here: it makes round(x, 2) inexact, and rounding is this function's contract.
+@njit(cache=True)
 def haversine_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Great-circle distance between two points on Earth."""
-    r = 6371.0  # kilometers
+    r = EARTH_RADIUS_KM
     d_lat = radians(lat2 - lat1)
     d_lon = radians(lon2 - lon1)
     lat1_rad = radians(lat1)
@@ -34,147 +45,243 @@ def haversine_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) ->
     return round(r * c, 2)
 
 
-def _resolve_team_coords(
-    team: str, teams_info: Optional[pd.DataFrame]
-) -> Optional[tuple[float, float]]:
-    if teams_info is not None and not teams_info.empty:
-        row = teams_info.loc[teams_info["nome_time"].str.lower() == team.lower()]
-        if not row.empty:
-            return float(row.iloc[0]["latitude"]), float(row.iloc[0]["longitude"])
+@njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def haversine_batch(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    cos_lat1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+    cos_lat2: np.ndarray,
+) -> np.ndarray:
+    """
+    Batched great-circle distance (km); coordinates are float arrays in radians.
+    cos(lat) is passed in precomputed, since points repeat across many rows.
+    """
+    n = lat1.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        d_lat = lat2[i] - lat1[i]
+        d_lon = lon2[i] - lon1[i]
+        a = sin(d_lat / 2) ** 2 + cos_lat1[i] * cos_lat2[i] * sin(d_lon / 2) ** 2
+        out[i] = 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+    return out
+
 
-    if team in TEAM_COORDINATES:
-        coords = TEAM_COORDINATES[team]
-        return coords["lat"], coords["lon"]
+# State -> capital coordinates in radians, ready for Series.map.
+_CAPITAL_LAT = {state: radians(c["lat"]) for state, c in CAPITAL_COORDINATES.items()}
+_CAPITAL_LON = {state: radians(c["lon"]) for state, c in CAPITAL_COORDINATES.items()}
+_CAPITAL_COS_LAT = {state: cos(lat) for state, lat in _CAPITAL_LAT.items()}
 
-    return None
+# Structure-of-arrays view of TEAM_COORDINATES (radians) for vectorized distance math.
+# Kept here rather than in coordinates.py so the harvester's import stays numpy-free.
+TEAM_INDEX = {name: i for i, name in enumerate(TEAM_COORDINATES)}
+TEAM_LAT = np.deg2rad(np.array([c["lat"] for c in TEAM_COORDINATES.values()], dtype=np.float64))
+TEAM_LON = np.deg2rad(np.array([c["lon"] for c in TEAM_COORDINATES.values()], dtype=np.float64))
+
+# Static part of the team lookup: normalized name -> (lat, lon) in radians.
+_TEAM_COORDINATES_NORMALIZED = {
+    normalize_team_name(name): (TEAM_LAT[i], TEAM_LON[i]) for name, i in TEAM_INDEX.items()
+}
+
+
+TeamCoords = Mapping[str, tuple[float, float]]
+
+
+def build_team_coords(teams_info: Optional[pd.DataFrame] = None) -> Dict[str, tuple[float, float]]:
+    """
+    Map normalized team name -> (lat, lon) in radians; teams_info overrides TEAM_COORDINATES.
+    Build it once and pass it to compute_travel_distance when calling it repeatedly.
+    """
+    team_coords = dict(_TEAM_COORDINATES_NORMALIZED)
+    if teams_info is not None and not teams_info.empty:
+        names = teams_info["nome_time"].astype(str).map(normalize_team_name)
+        first = ~names.duplicated().to_numpy()
+        lats = np.radians(teams_info["latitude"].astype(float).to_numpy())
+        lons = np.radians(teams_info["longitude"].astype(float).to_numpy())
+        team_coords.update(zip(names[first], zip(lats[first], lons[first])))
+    return team_coords
 
 
-def _resolve_city_coords(city: str, capital_hint: Optional[str]) -> Optional[tuple[float, float]]:
-    if not capital_hint:
-        return None
-    state = capital_hint.upper()
-    if state in CAPITAL_COORDINATES:
-        coords = CAPITAL_COORDINATES[state]
-        return coords["lat"], coords["lon"]
-    return None
+def _resolve_team_coords(
+    team: str, team_coords: TeamCoords | pd.DataFrame | None
+) -> Optional[tuple[float, float]]:
+    """
+    Return (lat, lon) in radians for a team.
+    A teams_info DataFrame (or None) is a convenience that builds the lookup first;
+    loops should pass a mapping from build_team_coords.
+    """
+    if team_coords is None or isinstance(team_coords, pd.DataFrame):
+        team_coords = build_team_coords(team_coords)
+    return team_coords.get(normalize_team_name(team))
 
 
 def compute_travel_distance(
     matches_df: pd.DataFrame,
-    teams_info_df: Optional[pd.DataFrame] = None,
+    teams_info_df: TeamCoords | pd.DataFrame | None = None,
     city_state_map: Optional[Dict[str, str]] = None,
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
     Add travel distance columns (km) for home and away teams.
 
     - Uses team coordinates from teams_info_df, otherwise TEAM_COORDINATES.
+      teams_info_df may also be a prebuilt build_team_coords() mapping.
     - Uses CAPITAL_COORDINATES as a fallback for the match city if no direct coordinate is known.
     - `cidade_jogo` may be in the form "Cidade-XX" to hint the state; city_state_map can override.
+    - copy=False adds the columns to matches_df in place instead of to a copy.
     """
-    df = matches_df.copy()
-    df["travel_km_home"] = None
-    df["travel_km_away"] = None
-
-    for idx, row in df.iterrows():
-        city_field = str(row.get("cidade_jogo") or "")
-        city_hint, state_hint = None, None
-        if "-" in city_field:
-            parts = city_field.rsplit("-", 1)
-            city_hint = parts[0].strip()
-            state_hint = parts[1].strip()
-        elif city_state_map and city_field in city_state_map:
-            state_hint = city_state_map[city_field]
-
-        match_coords = _resolve_city_coords(city_hint or city_field, state_hint)
-
-        for col, team in (("travel_km_home", row["time_casa"]), ("travel_km_away", row["time_fora"])):
-            base_coords = _resolve_team_coords(team, teams_info_df)
-            if not base_coords or not match_coords:
-                df.at[idx, col] = None
-                continue
-            if city_hint and normalize_team_name(team) in normalize_team_name(city_hint):
-                df.at[idx, col] = 0.0
-                continue
-            df.at[idx, col] = haversine_distance_km(
-                base_coords[0], base_coords[1], match_coords[0], match_coords[1]
-            )
+    df = matches_df.copy() if copy else matches_df
+
+    # Split "Cidade-XX" once for the whole column; rows without "-" fall back to city_state_map.
+    if "cidade_jogo" in df:
+        city_field = df["cidade_jogo"].fillna("").astype(str)
+    else:
+        city_field = pd.Series("", index=df.index)
+    # reindex keeps the three columns present even for an empty frame.
+    parts = city_field.str.rpartition("-").reindex(columns=[0, 1, 2], fill_value="")
+    has_hint = parts[1] == "-"
+    city_hint = parts[0].str.strip().where(has_hint)
+    state_hint = parts[2].str.strip().where(has_hint)
+    if city_state_map:
+        state_hint = state_hint.fillna(city_field.map(city_state_map))
+    state_hint = state_hint.astype(object).str.upper()
+    match_lat = state_hint.map(_CAPITAL_LAT).to_numpy(dtype=float)
+    match_lon = state_hint.map(_CAPITAL_LON).to_numpy(dtype=float)
+    match_cos_lat = state_hint.map(_CAPITAL_COS_LAT).to_numpy(dtype=float)
+
+    # Resolve each distinct team once against a prebuilt dict and broadcast to rows with map.
+    if teams_info_df is None or isinstance(teams_info_df, pd.DataFrame):
+        lookup = build_team_coords(teams_info_df)
+    else:
+        lookup = teams_info_df
+    teams = pd.unique(pd.concat([df["time_casa"], df["time_fora"]]).dropna())
+    team_coords = {team: _resolve_team_coords(team, lookup) for team in teams}
+    team_lat = {team: coords[0] for team, coords in team_coords.items() if coords}
+    team_lon = {team: coords[1] for team, coords in team_coords.items() if coords}
+    team_cos_lat = {team: cos(lat) for team, lat in team_lat.items()}
+
+    for col, team_col in (("travel_km_home", "time_casa"), ("travel_km_away", "time_fora")):
+        dist = np.round(
+            haversine_batch(
+                df[team_col].map(team_lat).to_numpy(dtype=float),
+                df[team_col].map(team_lon).to_numpy(dtype=float),
+                df[team_col].map(team_cos_lat).to_numpy(dtype=float),
+                match_lat,
+                match_lon,
+                match_cos_lat,
+            ),
+            2,
+        )
+        same_city = np.array(
+            [
+                isinstance(team, str)
+                and isinstance(hint, str)
+                and bool(hint)
+                and normalize_team_name(team) in normalize_team_name(hint)
+                for team, hint in zip(df[team_col], city_hint)
+            ],
+            dtype=bool,
+        )
+        df[col] = np.where(same_city & ~np.isnan(dist), 0.0, dist).astype(np.float32)
 
     return df
 
 
-def compute_rest_days(matches_df: pd.DataFrame) -> pd.DataFrame:
-    """Compute rest days between matches for home and away teams."""
-    df = matches_df.copy()
-    df["data"] = pd.to_datetime(df["data"])
-    df.sort_values("data", inplace=True)
+def _parse_dates(df: pd.DataFrame) -> None:
+    """Parse `data` in place, skipping frames an earlier feature step already parsed."""
+    if not pd.api.types.is_datetime64_any_dtype(df["data"]):
+        df["data"] = pd.to_datetime(df["data"], cache=True)
 
-    df["rest_days_home"] = None
-    df["rest_days_away"] = None
-    last_played: dict[str, pd.Timestamp] = {}
 
-    for idx, row in df.iterrows():
-        match_date = row["data"]
-        home = row["time_casa"]
-        away = row["time_fora"]
+def compute_rest_days(matches_df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """
+    Compute rest days between matches for home and away teams.
+    copy=False parses, sorts and extends matches_df in place instead of a copy.
+    """
+    df = matches_df.copy() if copy else matches_df
+    _parse_dates(df)
+    df.sort_values("data", inplace=True)
 
-        df.at[idx, "rest_days_home"] = (
-            (match_date - last_played[home]).days if home in last_played else None
-        )
-        df.at[idx, "rest_days_away"] = (
-            (match_date - last_played[away]).days if away in last_played else None
-        )
+    # Long format: one row per (match, team); `order` keeps the played order for ties on date.
+    n = len(df)
+    order = np.arange(n)
+    long_df = pd.concat(
+        [
+            pd.DataFrame(
+                {"order": order, "team": df["time_casa"].to_numpy(), "data": df["data"].array}
+            ),
+            pd.DataFrame(
+                {"order": order, "team": df["time_fora"].to_numpy(), "data": df["data"].array}
+            ),
+        ],
+        ignore_index=True,
+    ).sort_values(["team", "order"], kind="stable")
+    long_df["rest"] = long_df.groupby("team", sort=False)["data"].diff().dt.days
+
+    # Back in concat order: the first n rows are the home sides, the next n the away sides.
+    rest = long_df["rest"].sort_index().to_numpy()
+    df["rest_days_home"] = pd.array(rest[:n], dtype="Int16")
+    df["rest_days_away"] = pd.array(rest[n:], dtype="Int16")
+    return df
 
-        last_played[home] = match_date
-        last_played[away] = match_date
 
-    return df
+ROLLING_METRICS = ["goals_for", "goals_against", "xg_for", "xg_against"]
 
 
-def _rolling_mean_shifted(series: pd.Series, window: int) -> pd.Series:
-    return series.shift(1).rolling(window=window, min_periods=1).mean()
+# Per-side renames that turn a match row into a (team, for, against) row.
+_HOME_RENAMES = {
+    "time_casa": "team",
+    "gols_casa": "goals_for",
+    "gols_fora": "goals_against",
+    "xG_casa": "xg_for",
+    "xG_fora": "xg_against",
+}
+_AWAY_RENAMES = {
+    "time_fora": "team",
+    "gols_fora": "goals_for",
+    "gols_casa": "goals_against",
+    "xG_fora": "xg_for",
+    "xG_casa": "xg_against",
+}
+_LONG_COLUMNS = ["id_partida", "team", *ROLLING_METRICS, "data"]
 
 
-def compute_rolling_stats(matches_df: pd.DataFrame, window: int = 5) -> pd.DataFrame:
+def compute_rolling_stats(
+    matches_df: pd.DataFrame, window: int = 5, copy: bool = True
+) -> pd.DataFrame:
     """
     Compute rolling averages (last N matches) for goals and xG.
     Adds columns: gf_lastN_home, ga_lastN_home, xg_lastN_home, etc.
+    The result is always a new frame; copy=False only parses `data` in place on matches_df.
     """
-    df = matches_df.copy()
-    df["data"] = pd.to_datetime(df["data"])
-
-    long_rows: List[dict] = []
-    for _, row in df.iterrows():
-        long_rows.append(
-            {
-                "id_partida": row["id_partida"],
-                "team": row["time_casa"],
-                "goals_for": row.get("gols_casa"),
-                "goals_against": row.get("gols_fora"),
-                "xg_for": row.get("xG_casa"),
-                "xg_against": row.get("xG_fora"),
-                "data": row["data"],
-                "side": "home",
-            }
-        )
-        long_rows.append(
-            {
-                "id_partida": row["id_partida"],
-                "team": row["time_fora"],
-                "goals_for": row.get("gols_fora"),
-                "goals_against": row.get("gols_casa"),
-                "xg_for": row.get("xG_fora"),
-                "xg_against": row.get("xG_casa"),
-                "data": row["data"],
-                "side": "away",
-            }
-        )
-
-    long_df = pd.DataFrame(long_rows).sort_values(["team", "data"])
-
-    for metric in ["goals_for", "goals_against", "xg_for", "xg_against"]:
-        long_df[f"{metric}_roll"] = (
-            long_df.groupby("team")[metric].transform(lambda s: _rolling_mean_shifted(s, window))
-        )
+    df = matches_df.copy() if copy else matches_df
+    _parse_dates(df)
+
+    # `order` breaks ties on date by row order, as the row-by-row construction did.
+    order = np.arange(len(df))
+
+    # Column subsets keep the source dtypes; reindex fills absent metric columns with NaN.
+    long_df = pd.concat(
+        [
+            df.rename(columns=renames)
+            .reindex(columns=_LONG_COLUMNS)
+            .assign(order=order, side=side)
+            for side, renames in (("home", _HOME_RENAMES), ("away", _AWAY_RENAMES))
+        ],
+        ignore_index=True,
+    ).sort_values(["team", "data", "order"])
+    long_df[ROLLING_METRICS] = long_df[ROLLING_METRICS].astype(float)
+
+    # shift + groupby().rolling() stays on the cython path instead of a per-group lambda.
+    shifted = long_df.groupby("team", sort=False)[ROLLING_METRICS].shift(1)
+    rolled = (
+        shifted.groupby(long_df["team"], sort=False)
+        .rolling(window, min_periods=1)
+        .mean()
+        .reset_index(level=0, drop=True)
+    )
+    long_df[[f"{metric}_roll" for metric in ROLLING_METRICS]] = rolled[ROLLING_METRICS]
 
     home_stats = (
         long_df[long_df["side"] == "home"]
@@ -200,71 +307,102 @@ def compute_rolling_stats(matches_df: pd.DataFrame, window: int = 5) -> pd.DataF
     return merged
 
 
+KEY_PLAYER_FIELDS = ["id_jogador", "gols", "assistencias", "score"]
+_KEY_PLAYER_DTYPES = {
+    "id_jogador": "int64",
+    "gols": "int32",
+    "assistencias": "int32",
+    "score": "int32",
+}
+
+
+def _rank_key_players(
+    windows: pd.DataFrame, player_stats_df: pd.DataFrame, top_n: int
+) -> pd.DataFrame:
+    """Top players per (pos, side) window by goals + assists."""
+    # One join + one groupby for all windows instead of a small groupby per match and side.
+    recent = windows.merge(
+        player_stats_df[["id_partida", "id_jogador", "time", "gols", "assistencias"]],
+        on=["id_partida", "time"],
+    )
+    totals = (
+        recent.groupby(["pos", "side", "id_jogador"])[["gols", "assistencias"]]
+        .sum()
+        .reset_index()
+    )
+    totals["score"] = totals["gols"] + totals["assistencias"]
+    return (
+        totals.sort_values(
+            ["pos", "side", "score", "gols", "id_jogador"],
+            ascending=[True, True, False, False, True],
+        )
+        .groupby(["pos", "side"], sort=False)
+        .head(top_n)
+    )
+
+
 def compute_key_players(
     matches_df: pd.DataFrame,
     player_stats_df: pd.DataFrame,
     window: int = 5,
     top_n: int = 3,
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
     Compute key players based on goals + assists in last N matches.
     Requires player_stats_df with columns: id_partida, id_jogador, time, gols, assistencias.
+    copy=False adds the columns to matches_df in place instead of to a copy.
     """
-    df = matches_df.copy()
-    df["data"] = pd.to_datetime(df["data"])
-    player_stats_df = player_stats_df.copy()
-    player_stats_df["time"] = player_stats_df["time"].astype(str)
-
-    match_date_map = df.set_index("id_partida")["data"].to_dict()
-    team_matches: Dict[str, List[int]] = defaultdict(list)
-
-    for _, row in df.sort_values("data").iterrows():
-        team_matches[row["time_casa"]].append(row["id_partida"])
-        team_matches[row["time_fora"]].append(row["id_partida"])
-
-    key_home, key_away = {}, {}
-
-    for _, match in df.iterrows():
-        match_id = match["id_partida"]
-        match_date = match_date_map[match_id]
-        for side, team, target in (
-            ("home", match["time_casa"], key_home),
-            ("away", match["time_fora"], key_away),
-        ):
-            history_ids = [
-                mid
-                for mid in team_matches.get(team, [])
-                if match_date_map[mid] < match_date
-            ]
-            recent_ids = history_ids[-window:]
-            mask = (player_stats_df["time"] == str(team)) & (
-                player_stats_df["id_partida"].isin(recent_ids)
-            )
-            recent = player_stats_df.loc[mask]
-            if recent.empty:
-                target[match_id] = []
-                continue
-            grouped = (
-                recent.groupby("id_jogador")[["gols", "assistencias"]]
-                .sum()
-                .reset_index()
-            )
-            grouped["score"] = grouped["gols"] + grouped["assistencias"]
-            top_players = grouped.sort_values(
-                ["score", "gols"], ascending=False
-            ).head(top_n)
-            target[match_id] = [
-                {
-                    "id_jogador": int(row["id_jogador"]),
-                    "gols": int(row["gols"]),
-                    "assistencias": int(row["assistencias"]),
-                    "score": int(row["score"]),
-                }
-                for _, row in top_players.iterrows()
-            ]
-
-    df["key_players_home"] = df["id_partida"].map(key_home)
-    df["key_players_away"] = df["id_partida"].map(key_away)
+    df = matches_df.copy() if copy else matches_df
+    _parse_dates(df)
+    player_stats_df = player_stats_df.assign(time=player_stats_df["time"].astype(str))
+
+    # Per-team history sorted by date, so prior matches are found with a bisect.
+    team_dates: Dict[str, list] = defaultdict(list)
+    team_ids: Dict[str, List[int]] = defaultdict(list)
+    for match in df.sort_values("data", kind="stable").itertuples(index=False):
+        for team in (match.time_casa, match.time_fora):
+            team_dates[team].append(match.data)
+            team_ids[team].append(match.id_partida)
+
+    # Long table of (row, side, team, prior match id) covering every history window.
+    win_pos: List[int] = []
+    win_side: List[int] = []
+    win_team: List[str] = []
+    win_ids: List[int] = []
+    for pos, match in enumerate(df.itertuples(index=False)):
+        for side, team in ((0, match.time_casa), (1, match.time_fora)):
+            end = bisect_left(team_dates.get(team, []), match.data)
+            recent_ids = team_ids[team][max(end - window, 0):end] if end else []
+            win_pos.extend([pos] * len(recent_ids))
+            win_side.extend([side] * len(recent_ids))
+            win_team.extend([str(team)] * len(recent_ids))
+            win_ids.extend(recent_ids)
+    windows = pd.DataFrame(
+        {
+            # Typed explicitly so an empty window list still merges cleanly.
+            "pos": pd.Series(win_pos, dtype="int64"),
+            "side": pd.Series(win_side, dtype="int64"),
+            "time": pd.Series(win_team, dtype=player_stats_df["time"].dtype),
+            "id_partida": pd.Series(win_ids, dtype=player_stats_df["id_partida"].dtype),
+        }
+    )
+
+    top_players = _rank_key_players(windows, player_stats_df, top_n)
+
+    key_players: tuple[List[list], List[list]] = (
+        [[] for _ in range(len(df))],
+        [[] for _ in range(len(df))],
+    )
+    # Cast once on the frame; to_dict("records") then yields native ints without per-row casts.
+    records = top_players[KEY_PLAYER_FIELDS].astype(_KEY_PLAYER_DTYPES).to_dict("records")
+    for side, pos, record in zip(
+        top_players["side"].tolist(), top_players["pos"].tolist(), records
+    ):
+        key_players[side][pos].append(record)
+
+    df["key_players_home"] = pd.Series(key_players[0], index=df.index, dtype=object)
+    df["key_players_away"] = pd.Series(key_players[1], index=df.index, dtype=object)
     return df
 
 
@@ -279,47 +417,57 @@ def compute_importance_score(
     matches_df: pd.DataFrame,
     standings_df: Optional[pd.DataFrame],
     params: ImportanceParams = ImportanceParams(),
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
     Calculate importance based on round and proximity to G4/Z4.
     standings_df must contain columns: rodada, time, posicao, pontos.
+    copy=False adds the columns to matches_df in place instead of to a copy.
     """
-    df = matches_df.copy()
+    df = matches_df.copy() if copy else matches_df
     if standings_df is None or standings_df.empty:
-        df["importance_home"] = None
-        df["importance_away"] = None
+        df["importance_home"] = np.full(len(df), np.nan, dtype=np.float32)
+        df["importance_away"] = np.full(len(df), np.nan, dtype=np.float32)
         return df
 
-    standings_df = standings_df.copy()
-    standings_df["rodada"] = standings_df["rodada"].astype(int)
-
-    def team_score(team: str, rodada: Optional[int | str]) -> Optional[float]:
-        if rodada is None:
-            return None
-        if isinstance(rodada, str):
-            digits = "".join(ch for ch in rodada if ch.isdigit())
-            rodada = int(digits) if digits else None
-        table = standings_df[standings_df["rodada"] == rodada]
-        if table.empty:
-            return None
-        team_row = table.loc[table["time"].str.lower() == team.lower()]
-        if team_row.empty:
-            return None
-        pontos = float(team_row.iloc[0]["pontos"])
-        g4_row = table.loc[table["posicao"] == params.g4_cutoff]
-        z4_row = table.loc[table["posicao"] == params.z4_cutoff]
-        if g4_row.empty or z4_row.empty:
-            return None
-        gap_g4 = float(g4_row.iloc[0]["pontos"]) - pontos
-        gap_z4 = pontos - float(z4_row.iloc[0]["pontos"])
-        tension = 1 / (1 + max(gap_g4, 0) + max(gap_z4, 0))
-        stage_factor = 1.0 if rodada >= params.high_round_threshold else 0.5
-        return round(tension * stage_factor, 3)
-
-    df["importance_home"] = df.apply(
-        lambda row: team_score(row["time_casa"], row.get("rodada")), axis=1
+    # Plain arrays -> dict lookups, built once. Reversed so the first standings row
+    # wins on duplicates, as the row-filtering version did.
+    rod_arr = standings_df["rodada"].astype(int).to_numpy()[::-1]
+    pos_arr = standings_df["posicao"].to_numpy()[::-1]
+    pts_arr = standings_df["pontos"].astype(float).to_numpy()[::-1]
+    team_arr = standings_df["time"].str.lower().to_numpy()[::-1]
+    team_points = dict(zip(zip(rod_arr, team_arr), pts_arr))
+    position_points = dict(zip(zip(rod_arr, pos_arr), pts_arr))
+
+    # Round labels such as "Regular Season - 12" keep only their digits.
+    raw_rodada = df["rodada"] if "rodada" in df else pd.Series(None, index=df.index, dtype=object)
+    if pd.api.types.is_numeric_dtype(raw_rodada):
+        rodada = raw_rodada.astype(float)
+    else:
+        rodada = pd.to_numeric(
+            raw_rodada.astype(str).str.replace(r"\D", "", regex=True), errors="coerce"
+        ).where(raw_rodada.notna())
+    rodada_keys = [None if np.isnan(r) else int(r) for r in rodada.to_numpy(dtype=float)]
+
+    g4_base = np.array(
+        [position_points.get((r, params.g4_cutoff), np.nan) for r in rodada_keys], dtype=float
     )
-    df["importance_away"] = df.apply(
-        lambda row: team_score(row["time_fora"], row.get("rodada")), axis=1
+    z4_base = np.array(
+        [position_points.get((r, params.z4_cutoff), np.nan) for r in rodada_keys], dtype=float
     )
+    stage_factor = np.where(rodada.to_numpy(dtype=float) >= params.high_round_threshold, 1.0, 0.5)
+
+    for col, team_col in (("importance_home", "time_casa"), ("importance_away", "time_fora")):
+        pontos = np.fromiter(
+            (
+                team_points.get((r, team.lower()), np.nan)
+                for r, team in zip(rodada_keys, df[team_col])
+            ),
+            dtype=float,
+            count=len(df),
+        )
+        gap_g4 = g4_base - pontos
+        gap_z4 = pontos - z4_base
+        tension = 1 / (1 + np.maximum(gap_g4, 0) + np.maximum(gap_z4, 0))
+        df[col] = np.round(tension * stage_factor, 3).astype(np.float32)
     return df